@@ -2,54 +2,105 @@
 
 from __future__ import annotations
 
+import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from zipfile import ZipFile
+from typing import Callable, List
+from zipfile import ZipFile, ZipInfo
 
+from . import config
 from .models import Job
+from .workers import WorkerJob
 
+_COPY_BUFFER_SIZE = 1024 * 1024
+# How many entries to extract between progress reports.
+_PROGRESS_INTERVAL = 100
 
-def extract_archive(job: Job) -> None:
+
+def extract_archive(job: Job | WorkerJob) -> None:
     """Unpack the downloaded archive into the job's extraction directory."""
 
     extract_path = job.extract_path
-    extract_path.mkdir(parents=True, exist_ok=True)
-
-    if any(extract_path.iterdir()):
-        _clear_directory(extract_path)
+    # Anything already here is a partial extraction from an interrupted run.
+    shutil.rmtree(extract_path, ignore_errors=True)
+    extract_path.mkdir(parents=True)
 
     with ZipFile(job.archive_path) as archive:
         members = archive.infolist()
-        total = len(members)
-        for index, member in enumerate(members, start=1):
-            _extract_member(archive, member, extract_path)
-            if total:
-                progress = index / total
-                detail = f"Extracted {index}/{total} entries"
-                job.set_progress(progress, detail=detail)
+    total = len(members)
+    if not total:
+        return
+
+    base_dir = extract_path.resolve()
+    report = _progress_reporter(job, total)
+    stop = threading.Event()
+    workers = min(config.DEFAULT_EXTRACT_WORKERS, total)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract") as pool:
+        futures = [
+            pool.submit(_extract_members, job.archive_path, members[offset::workers], base_dir, report, stop)
+            for offset in range(workers)
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            stop.set()
+            raise
+
 
+def _progress_reporter(job: Job | WorkerJob, total: int) -> Callable[[], None]:
+    lock = threading.Lock()
+    done = 0
 
-def _clear_directory(path: Path) -> None:
-    for item in path.iterdir():
-        if item.is_dir():
-            shutil.rmtree(item)
-        else:
-            item.unlink()
+    def report() -> None:
+        nonlocal done
+        with lock:
+            done += 1
+            # Published under the lock so reports from different threads cannot land out of order.
+            if done % _PROGRESS_INTERVAL == 0 or done == total:
+                job.set_progress(done / total, detail=f"Extracted {done}/{total} entries")
 
+    return report
 
-def _extract_member(archive: ZipFile, member, target_dir: Path) -> None:
+
+def _extract_members(
+    archive_path: Path,
+    members: List[ZipInfo],
+    target_dir: Path,
+    report: Callable[[], None],
+    stop: threading.Event,
+) -> None:
+    # ZipFile handles are not safe to share between threads, so each worker opens its own.
+    with ZipFile(archive_path) as archive:
+        for member in members:
+            if stop.is_set():
+                return
+            _extract_member(archive, member, target_dir)
+            report()
+
+
+def _extract_member(archive: ZipFile, member: ZipInfo, target_dir: Path) -> None:
     target_path = _safe_destination(target_dir, member.filename)
     if member.is_dir():
         target_path.mkdir(parents=True, exist_ok=True)
         return
     target_path.parent.mkdir(parents=True, exist_ok=True)
+    # Copy in bounded chunks so memory stays flat however large the member inflates to.
     with archive.open(member, "r") as src, target_path.open("wb") as dst:
-        shutil.copyfileobj(src, dst, length=1024 * 1024)
+        shutil.copyfileobj(src, dst, _COPY_BUFFER_SIZE)
 
 
 def _safe_destination(base_dir: Path, name: str) -> Path:
-    destination = base_dir / name
-    resolved = destination.resolve()
-    if not str(resolved).startswith(str(base_dir.resolve())):
+    """Map an archive member onto ``base_dir``, which must already be resolved."""
+
+    normalised = os.path.normpath(name)
+    if (
+        os.path.isabs(normalised)
+        or os.path.splitdrive(normalised)[0]
+        or normalised == os.pardir
+        or normalised.startswith(os.pardir + os.sep)
+    ):
         raise ValueError(f"Archive member escapes extraction directory: {name}")
-    return resolved
+    return base_dir / normalised
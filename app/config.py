@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 APP_ROOT = Path(__file__).resolve().parent.parent
@@ -15,3 +16,7 @@ for directory in (DATA_DIR, DOWNLOAD_DIR, EXTRACT_DIR, INDEX_DIR, TMP_DIR):
     directory.mkdir(parents=True, exist_ok=True)
 
 DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+# Parallel ranged connections used for archives large enough to be split.
+DEFAULT_DOWNLOAD_CONNECTIONS = 6
+# zlib releases the GIL while inflating, so extraction threads decompress members on separate cores.
+DEFAULT_EXTRACT_WORKERS = min(32, os.cpu_count() or 1)
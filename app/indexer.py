@@ -2,37 +2,81 @@
 
 from __future__ import annotations
 
-import json
+import os
 import sqlite3
-from datetime import datetime, timezone
+import time
 from pathlib import Path
-from typing import Iterator, List, Optional, Tuple
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple
+
+import ijson
 
 from .models import Job
+from .workers import WorkerJob
+
+# Container keys checked, in order, when conversations.json wraps the list in an object.
+_CONVERSATION_CONTAINER_KEYS = ("conversations", "items", "data")
+# The index is always rebuilt from the extracted export, so durability is traded for load speed.
+# Safe only because the build writes a fresh scratch file that replaces the index once complete.
+_BULK_LOAD_PRAGMAS = (
+    "PRAGMA journal_mode=OFF",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-262144",  # 256 MiB
+    "PRAGMA locking_mode=EXCLUSIVE",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+)
+# Kept as one module-level string so sqlite3's statement cache always hits.
+_INSERT_SQL = "INSERT INTO conversations (conversation_id, title, timestamp, content) VALUES (?, ?, ?, ?)"
+# Second-resolution ISO 8601 in UTC, filled from a time.struct_time prefix.
+_ISO8601_UTC = "%04d-%02d-%02dT%02d:%02d:%02d+00:00"
+# File types indexed when the export has no conversations.json.
+_TEXT_EXTENSIONS = frozenset({"json", "txt", "md", "csv"})
+# Rows buffered before each executemany flush; progress is reported per flush.
+_BATCH_SIZE = 1000
 
 
-def build_index_for_job(job: Job) -> None:
+def build_index_for_job(job: Job | WorkerJob) -> None:
     """Create or refresh the search index for a processed job."""
 
     build_index(job.extract_path, job.index_path, job)
 
 
-def build_index(extracted_dir: Path, index_path: Path, job: Job | None = None) -> None:
+def build_index(extracted_dir: Path, index_path: Path, job: Job | WorkerJob | None = None) -> None:
     index_path.parent.mkdir(parents=True, exist_ok=True)
-    connection = sqlite3.connect(index_path)
+    # Without a journal, a build killed midway leaves a malformed database; building into a
+    # scratch file means the live index is only ever the previous or the finished one.
+    build_path = index_path.with_name(index_path.name + ".tmp")
+    build_path.unlink(missing_ok=True)
+    try:
+        _build_into(build_path, extracted_dir, job)
+    except BaseException:
+        build_path.unlink(missing_ok=True)
+        raise
+    os.replace(build_path, index_path)
+
+
+def _build_into(build_path: Path, extracted_dir: Path, job: Job | WorkerJob | None) -> None:
+    connection = sqlite3.connect(build_path, cached_statements=1024)
     try:
+        _configure_bulk_load(connection)
+        # A fresh file starts empty, which is far cheaper than deleting every row from an FTS5 index.
         _initialise_schema(connection)
-        connection.execute("DELETE FROM conversations")
         connection.commit()
 
         conversation_file = extracted_dir / "conversations.json"
-        if conversation_file.exists():
-            conversations = _load_conversations(conversation_file)
-            _insert_conversations(connection, conversations, job)
-        else:
-            documents = list(_walk_text_documents(extracted_dir))
-            _insert_documents(connection, documents, job)
-        connection.commit()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            if conversation_file.exists():
+                size = conversation_file.stat().st_size or 1
+                with conversation_file.open("rb") as handle:
+                    conversations = _iter_conversations(handle)
+                    _insert_conversations(connection, conversations, job, lambda: handle.tell() / size)
+            else:
+                documents = list(_walk_text_documents(extracted_dir))
+                _insert_documents(connection, documents, job)
+        with connection:
+            # Merge the FTS segments written by the batches into a single b-tree.
+            connection.execute("INSERT INTO conversations(conversations) VALUES('optimize')")
     finally:
         connection.close()
 
@@ -60,6 +104,11 @@ def query_index(index_path: Path, query: str, limit: int = 25) -> List[dict[str,
         connection.close()
 
 
+def _configure_bulk_load(connection: sqlite3.Connection) -> None:
+    for pragma in _BULK_LOAD_PRAGMAS:
+        connection.execute(pragma)
+
+
 def _initialise_schema(connection: sqlite3.Connection) -> None:
     connection.execute(
         """
@@ -67,134 +116,186 @@ def _initialise_schema(connection: sqlite3.Connection) -> None:
             conversation_id UNINDEXED,
             title,
             timestamp,
-            content
+            content,
+            tokenize='unicode61 remove_diacritics 2'
         )
         """
     )
 
 
-def _load_conversations(path: Path) -> List[dict]:
-    with path.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
-    if isinstance(data, list):
-        return data
-    if isinstance(data, dict):
-        for key in ("conversations", "items", "data"):
-            if key in data and isinstance(data[key], list):
-                return data[key]
-    return []
+def _iter_conversations(handle: BinaryIO) -> Iterator[dict]:
+    """Stream conversations from an export file without loading it whole."""
+
+    first = _peek_first_byte(handle)
+    if first == b"[":
+        yield from ijson.items(handle, "item", use_float=True)
+    elif first == b"{":
+        for key in _CONVERSATION_CONTAINER_KEYS:
+            handle.seek(0)
+            found = False
+            for conversation in ijson.items(handle, f"{key}.item", use_float=True):
+                found = True
+                yield conversation
+            if found:
+                return
+
+
+def _peek_first_byte(handle: BinaryIO) -> bytes:
+    while True:
+        block = handle.read(4096)
+        if not block:
+            return b""
+        stripped = block.lstrip()
+        if stripped:
+            handle.seek(0)
+            return stripped[:1]
 
 
-def _insert_conversations(connection: sqlite3.Connection, conversations: List[dict], job: Job | None) -> None:
-    total = len(conversations) or 1
+def _insert_conversations(
+    connection: sqlite3.Connection,
+    conversations: Iterable[dict],
+    job: Job | WorkerJob | None,
+    position: Callable[[], float] | None = None,
+) -> None:
+    batch: List[Tuple[str, str, str, str]] = []
+    index = 0
     for index, conversation in enumerate(conversations, start=1):
         conv_id = str(conversation.get("id") or index)
         title = conversation.get("title") or f"Conversation {index}"
         timestamp = _format_timestamp(conversation.get("create_time") or conversation.get("update_time"))
         content = _conversation_to_text(conversation)
-        connection.execute(
-            "INSERT INTO conversations (conversation_id, title, timestamp, content) VALUES (?, ?, ?, ?)",
-            (conv_id, title, timestamp, content),
-        )
-        if job:
-            progress = index / total
-            detail = f"Indexed {index}/{total} conversations"
-            job.set_progress(progress, detail=detail)
+        batch.append((conv_id, title, timestamp, content))
+        if len(batch) >= _BATCH_SIZE:
+            _flush_rows(connection, batch)
+            if job:
+                progress = min(position(), 1.0) if position else None
+                job.set_progress(progress, detail=f"Indexed {index} conversations")
+    _flush_rows(connection, batch)
+    if job:
+        job.set_progress(1.0, detail=f"Indexed {index} conversations")
 
 
-def _insert_documents(connection: sqlite3.Connection, documents: List[Tuple[str, str, str]], job: Job | None) -> None:
+def _insert_documents(
+    connection: sqlite3.Connection,
+    documents: List[Tuple[str, str, str]],
+    job: Job | WorkerJob | None,
+) -> None:
     total = len(documents) or 1
+    batch: List[Tuple[str, str, str, str]] = []
     for index, (identifier, title, content) in enumerate(documents, start=1):
-        connection.execute(
-            "INSERT INTO conversations (conversation_id, title, timestamp, content) VALUES (?, ?, ?, ?)",
-            (identifier, title, "", content),
-        )
-        if job:
-            progress = index / total
-            detail = f"Indexed {index}/{total} documents"
-            job.set_progress(progress, detail=detail)
+        batch.append((identifier, title, "", content))
+        if len(batch) >= _BATCH_SIZE or index == total:
+            _flush_rows(connection, batch)
+            if job:
+                progress = index / total
+                detail = f"Indexed {index}/{total} documents"
+                job.set_progress(progress, detail=detail)
+
+
+def _flush_rows(connection: sqlite3.Connection, batch: List[Tuple[str, str, str, str]]) -> None:
+    if not batch:
+        return
+    connection.executemany(_INSERT_SQL, batch)
+    batch.clear()
 
 
 def _conversation_to_text(conversation: dict) -> str:
-    parts: List[str] = []
     title = conversation.get("title")
-    if title:
-        parts.append(str(title))
+    parts: List[str] = [str(title)] if title else []
     mapping = conversation.get("mapping")
     if isinstance(mapping, dict):
-        ordered_messages = _order_messages(mapping)
-        for message in ordered_messages:
-            role = message.get("author", {}).get("role", "unknown")
-            text = _extract_message_text(message)
+        extract = _extract_message_text
+        append = parts.append
+        for message in _order_messages(mapping):
+            text = extract(message)
             if text:
-                parts.append(f"{role}: {text}")
+                author = message.get("author")
+                role = author.get("role", "unknown") if author else "unknown"
+                append(f"{role}: {text}")
     return "\n\n".join(parts)
 
 
 def _order_messages(mapping: dict) -> List[dict]:
     messages = []
+    append = messages.append
     for node in mapping.values():
         message = node.get("message") if isinstance(node, dict) else None
         if message:
-            messages.append(message)
-    messages.sort(key=lambda m: m.get("create_time") or 0)
+            append(message)
+    messages.sort(key=_message_sort_key)
     return messages
 
 
+def _message_sort_key(message: dict) -> float:
+    return message.get("create_time") or 0
+
+
 def _extract_message_text(message: dict) -> str:
     content = message.get("content")
     if isinstance(content, dict):
-        if content.get("parts"):
-            collected: List[str] = []
-            for part in content["parts"]:
-                text = _normalise_part(part)
-                if text:
-                    collected.append(text)
-            return "\n".join(collected)
-        if content.get("text"):
-            return str(content["text"])
-    if isinstance(content, list):
-        collected = []
-        for part in content:
-            text = _normalise_part(part)
-            if text:
-                collected.append(text)
-        return "\n".join(collected)
-    if isinstance(content, str):
+        parts = content.get("parts")
+        if not parts:
+            text = content.get("text")
+            return str(text) if text else ""
+    elif isinstance(content, list):
+        parts = content
+    elif isinstance(content, str):
         return content
-    return ""
+    else:
+        return ""
+    # A plain loop beats a comprehension here: most messages have only one or two parts.
+    normalise = _normalise_part
+    collected: List[str] = []
+    for part in parts:
+        # Plain strings are by far the most common part; skip the dispatch for them.
+        text = part.strip() if type(part) is str else normalise(part)
+        if text:
+            collected.append(text)
+    return "\n".join(collected)
 
 
 def _normalise_part(part) -> str:
-    if isinstance(part, str):
-        return part.strip()
-    if isinstance(part, dict):
-        if "text" in part and isinstance(part["text"], str):
-            return part["text"].strip()
-        if "value" in part and isinstance(part["value"], str):
-            return part["value"].strip()
-    return ""
+    handler = _PART_HANDLERS.get(type(part))
+    return handler(part) if handler is not None else ""
+
+
+def _normalise_dict_part(part: dict) -> str:
+    text = part.get("text")
+    if not isinstance(text, str):
+        text = part.get("value")
+        if not isinstance(text, str):
+            return ""
+    return text.strip()
+
+
+# Parts decoded from JSON are exact builtin types, so dispatching on type() is safe.
+_PART_HANDLERS = {str: str.strip, dict: _normalise_dict_part}
 
 
 def _walk_text_documents(root: Path) -> Iterator[Tuple[str, str, str]]:
-    for path in root.rglob("*"):
-        if path.is_dir():
-            continue
-        if path.suffix.lower() not in {".json", ".txt", ".md", ".csv"}:
-            continue
-        try:
-            content = path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            continue
-        yield (str(path.relative_to(root)), path.name, content)
+    root_str = str(root)
+    prefix_length = len(root_str) + 1
+    pending = [root_str]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                # DirEntry caches the type from readdir, so this costs no extra stat.
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                    continue
+                stem, _, extension = entry.name.rpartition(".")
+                if not stem or extension.lower() not in _TEXT_EXTENSIONS or not entry.is_file():
+                    continue
+                with open(entry.path, "rb") as handle:
+                    content = handle.read().decode("utf-8", errors="replace")
+                yield (entry.path[prefix_length:], entry.name, content)
 
 
 def _format_timestamp(value: Optional[float]) -> str:
     if value in (None, ""):
         return ""
     try:
-        timestamp = float(value)
-    except (TypeError, ValueError):
+        # time.gmtime formats in C; building a datetime per conversation is measurably slower.
+        return _ISO8601_UTC % time.gmtime(float(value))[:6]
+    except (TypeError, ValueError, OverflowError, OSError):
         return str(value)
-    dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-    return dt.isoformat()
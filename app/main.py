@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from fastapi import Depends, FastAPI, Form, HTTPException, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
 
 from .manager import JobManager
 from .models import JobInfo
+from .utils import dump_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson instead of the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
 
-app = FastAPI(title="ChatGPT Backup Manager", version="0.1.0")
+app = FastAPI(title="ChatGPT Backup Manager", version="0.1.0", default_response_class=FastJSONResponse)
 templates = Jinja2Templates(directory="templates")
 manager = JobManager()
 
@@ -23,6 +34,11 @@ async def _startup_manager() -> None:
     await manager.startup()
 
 
+@app.on_event("shutdown")
+async def _shutdown_manager() -> None:
+    await manager.shutdown()
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request, manager: JobManager = Depends(get_manager)) -> HTMLResponse:
     jobs = await manager.list_jobs()
@@ -82,17 +98,16 @@ async def search(
 
 
 @app.get("/api/jobs")
-async def api_list_jobs(manager: JobManager = Depends(get_manager)):
-    jobs = await manager.list_jobs()
-    return [job.dict() for job in jobs]
+async def api_list_jobs(manager: JobManager = Depends(get_manager)) -> Response:
+    return Response(content=await manager.list_jobs_json(), media_type="application/json")
 
 
 @app.get("/api/jobs/{job_id}")
-async def api_get_job(job_id: str, manager: JobManager = Depends(get_manager)):
-    job = await manager.get_job(job_id)
-    if not job:
+async def api_get_job(job_id: str, manager: JobManager = Depends(get_manager)) -> Response:
+    payload = await manager.get_job_json(job_id)
+    if payload is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job.dict()
+    return Response(content=payload, media_type="application/json")
 
 
 @app.get("/api/jobs/{job_id}/search")
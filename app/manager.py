@@ -3,32 +3,78 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import binascii
+import contextlib
+import hashlib
 import json
 import logging
+import os
+import random
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from uuid import uuid4
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
 from . import config, indexer
 from .archive import extract_archive
 from .models import Job, JobInfo, JobStatus
-from .utils import human_readable_bytes
+from .utils import dump_json, human_readable_bytes, load_json
+from .workers import WorkerPool
 
 logger = logging.getLogger(__name__)
 
+# Download progress text is refreshed at most this often; persistence is debounced separately.
+_PROGRESS_INTERVAL_SECONDS = 0.2
+_DOWNLOAD_ATTEMPTS = 3
+# Wait before each retry; the final failed attempt is not followed by a sleep.
+_RETRY_BACKOFF_SECONDS = (2, 4)
+# Archives smaller than this are fetched over a single connection.
+_SEGMENTED_DOWNLOAD_MIN_BYTES = 16 * 1024 * 1024
+_REQUEST_HEADERS = {"User-Agent": "ChatGPT-Backup-Manager/1.0"}
+# Job changes are coalesced for this long before being written to disk.
+_PERSIST_DEBOUNCE_SECONDS = 0.5
+# jobs.json is rewritten from scratch once the change journal reaches this many entries.
+_JOURNAL_COMPACT_THRESHOLD = 1000
+
+
+class _RangeNotHonoured(Exception):
+    """Raised when a server answers a range request with the full body."""
+
 
 class JobManager:
     """Coordinates download, extraction, and indexing of backups."""
 
     def __init__(self) -> None:
         self._jobs_file: Path = config.DATA_DIR / "jobs.json"
+        self._journal_file: Path = config.DATA_DIR / "jobs.ndjson"
+        self._journal_entries = 0
+        # Bumped on every compaction and stamped on each journal line, so lines written before
+        # the current jobs.json (left behind by a crash mid-compaction) are not replayed over it.
+        self._generation = 0
+        self._persisted: Dict[str, dict[str, Any]] = {}
+        # Only mutated on the event loop; single dict operations are atomic, so no lock is needed.
         self._jobs: Dict[str, Job] = {}
-        self._lock = asyncio.Lock()
+        self._info_cache: Dict[str, Tuple[int, JobInfo]] = {}
+        self._json_cache: Dict[str, Tuple[int, bytes]] = {}
         self._storage_lock = asyncio.Lock()
         self._startup_lock = asyncio.Lock()
+        self._dirty_event = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._persister: Optional[asyncio.Task[None]] = None
         self._resume_job_ids: List[str] = []
+        # Running _run_job tasks, so shutdown can cancel them before closing what they use.
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._closed = False
+        # Extraction and indexing are CPU-bound, so they run in worker processes.
+        self._workers = WorkerPool(self._apply_worker_progress)
+        # Archive writes go through one dedicated thread so disk I/O never blocks the event loop.
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive-writer")
+        self._client: Optional[httpx.AsyncClient] = None
         self._load_jobs()
         self._startup_complete = not bool(self._resume_job_ids)
 
@@ -43,9 +89,35 @@ class JobManager:
             await self._reconcile_startup_jobs()
             self._startup_complete = True
 
+    async def shutdown(self) -> None:
+        """Stop background work and flush any pending job changes.
+
+        Running jobs are cancelled rather than failed, so they keep their stage and are
+        re-queued on the next start.
+        """
+
+        self._closed = True
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.to_thread(self._workers.shutdown)
+        await asyncio.to_thread(self._writer.shutdown)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._persister is not None:
+            self._persister.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._persister
+            self._persister = None
+        await self._persist_jobs()
+
     async def create_job(self, url: str) -> Job:
         await self.startup()
-        job_id = uuid4().hex
+        if self._closed:
+            raise RuntimeError("Job manager has been shut down")
+        job_id = secrets.token_hex(16)
         archive_path = config.DOWNLOAD_DIR / f"{job_id}.zip"
         extract_path = config.EXTRACT_DIR / job_id
         index_path = config.INDEX_DIR / f"{job_id}.sqlite3"
@@ -56,30 +128,41 @@ class JobManager:
             extract_path=extract_path,
             index_path=index_path,
         )
-        async with self._lock:
-            self._jobs[job_id] = job
-        await self._persist_jobs()
-        asyncio.create_task(self._run_job(job))
+        job.on_change = self._job_changed
+        self._jobs[job_id] = job
+        self._mark_dirty()
+        self._start_job(job)
         return job
 
     async def list_jobs(self) -> List[JobInfo]:
         await self.startup()
-        async with self._lock:
-            jobs = list(self._jobs.values())
-        return [JobInfo.from_job(job) for job in jobs]
+        jobs = list(self._jobs.values())
+        return [self._job_info(job) for job in jobs]
+
+    async def list_jobs_json(self) -> bytes:
+        """Return the JSON encoding of :meth:`list_jobs`, reusing cached per-job payloads."""
+
+        await self.startup()
+        jobs = list(self._jobs.values())
+        return b"[" + b",".join(self._job_json(job) for job in jobs) + b"]"
 
     async def get_job(self, job_id: str) -> Optional[JobInfo]:
         await self.startup()
-        async with self._lock:
-            job = self._jobs.get(job_id)
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        return self._job_info(job)
+
+    async def get_job_json(self, job_id: str) -> Optional[bytes]:
+        await self.startup()
+        job = self._jobs.get(job_id)
         if job is None:
             return None
-        return JobInfo.from_job(job)
+        return self._job_json(job)
 
     async def get_job_internal(self, job_id: str) -> Optional[Job]:
         await self.startup()
-        async with self._lock:
-            return self._jobs.get(job_id)
+        return self._jobs.get(job_id)
 
     async def search(self, job_id: str, query: str, limit: int = 25) -> List[dict[str, str]]:
         await self.startup()
@@ -90,125 +173,340 @@ class JobManager:
             raise RuntimeError("Job has not completed indexing yet")
         return indexer.query_index(job.index_path, query, limit)
 
+    def _start_job(self, job: Job) -> None:
+        task = asyncio.create_task(self._run_job(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
     async def _run_job(self, job: Job) -> None:
         try:
             job.set_stage("queued", JobStatus.PENDING, detail="Awaiting processing")
-            await self._persist_jobs()
-            await asyncio.sleep(0)
             await self._download(job)
             job.set_stage("downloaded", JobStatus.DOWNLOADED, detail="Archive downloaded")
-            await self._persist_jobs()
             await self._extract(job)
             job.set_stage("extracted", JobStatus.EXTRACTED, detail="Files unpacked")
-            await self._persist_jobs()
             await self._index(job)
-            job.set_stage("completed", JobStatus.COMPLETED, detail="Index ready")
-            job.set_progress(1.0)
-            await self._persist_jobs()
+            job.set_stage("completed", JobStatus.COMPLETED, detail="Index ready", progress=1.0)
         except Exception as exc:  # pragma: no cover - safety net
             logger.exception("Job %s failed", job.id)
-            job.set_stage("failed", JobStatus.FAILED, detail=str(exc))
-            job.update(message=str(exc))
-            await self._persist_jobs()
+            job.set_stage("failed", JobStatus.FAILED, detail=str(exc), message=str(exc))
 
     async def _download(self, job: Job) -> None:
-        job.set_stage("downloading", JobStatus.DOWNLOADING, detail="Starting download")
-        job.set_progress(0.0)
-        await self._persist_jobs()
-        retries = 3
-        backoff = 2
+        job.set_stage("downloading", JobStatus.DOWNLOADING, detail="Starting download", progress=0.0)
         last_error: Optional[Exception] = None
-        for attempt in range(1, retries + 1):
+        for attempt in range(1, _DOWNLOAD_ATTEMPTS + 1):
             try:
                 await self._stream_download(job)
                 return
             except Exception as exc:
                 last_error = exc
-                wait_for = backoff ** attempt
+                if _is_client_error(exc):
+                    # An expired or forbidden link will not start working on a retry.
+                    raise RuntimeError(f"Download failed: {exc}") from exc
+                if attempt == _DOWNLOAD_ATTEMPTS:
+                    break
                 job.set_stage(
                     "downloading",
-                    detail=f"Retry {attempt}/{retries} after error: {exc}",
+                    detail=f"Retry {attempt}/{_DOWNLOAD_ATTEMPTS} after error: {exc}",
                 )
-                await self._persist_jobs()
-                await asyncio.sleep(wait_for)
-        raise RuntimeError(f"Download failed after {retries} attempts: {last_error}")
+                # Jitter keeps jobs that failed together from retrying in lockstep.
+                await asyncio.sleep(_RETRY_BACKOFF_SECONDS[attempt - 1] + random.uniform(0, 1))
+        raise RuntimeError(f"Download failed after {_DOWNLOAD_ATTEMPTS} attempts: {last_error}")
 
     async def _stream_download(self, job: Job) -> None:
+        if job.segments and not job.archive_path.exists():
+            # The partially fetched ranges were lost with the file; start over.
+            job.update(segments=None, bytes_downloaded=0)
         resume_position = 0
-        if job.archive_path.exists():
-            resume_position = job.archive_path.stat().st_size
+        if not job.segments and job.archive_path.exists():
+            # The archive is preallocated to its full size, so the file length says nothing
+            # about progress; the persisted byte count is the high-water mark of written data.
+            resume_position = min(job.bytes_downloaded, job.archive_path.stat().st_size)
+        if job.total_bytes and resume_position >= job.total_bytes:
+            # Fully downloaded before a restart; a range request would only get a 416.
+            return
+
+        client = self._http_client()
+        # The archive's SHA-256 as advertised by the first response that carries one.
+        advertised: List[bytes] = []
+        if not job.segments and not resume_position:
+            await self._plan_segments(client, job, advertised)
+        if job.segments:
+            if await self._download_segments(client, job, advertised):
+                # Ranges arrive out of order, so the finished file is hashed in one pass instead.
+                await self._verify_archive(job, advertised)
+                return
+            # A range request came back as a full body; fetch the archive in one piece instead.
+            job.update(segments=None, bytes_downloaded=0)
 
-        headers = {"User-Agent": "ChatGPT-Backup-Manager/1.0"}
+        headers = dict(_REQUEST_HEADERS)
         if resume_position:
             headers["Range"] = f"bytes={resume_position}-"
+        async with client.stream("GET", job.url, headers=headers) as response:
+            if response.status_code == 416 and _is_complete(job, response, resume_position):
+                # Fully downloaded before a restart that lost the size; nothing is left to fetch.
+                job.set_total_bytes(resume_position)
+                _note_advertised_sha256(response, advertised)
+                await self._verify_archive(job, advertised)
+                self._download_reporter(job)(final=True)
+                return
+            response.raise_for_status()
+            if resume_position and response.status_code != 206:
+                # Server ignored the range request; restart from scratch
+                resume_position = 0
+            total = response.headers.get("Content-Length")
+            if total is not None:
+                total_bytes = int(total)
+                if resume_position and response.status_code == 206:
+                    total_bytes += resume_position
+            else:
+                total_bytes = None
+            job.set_total_bytes(total_bytes)
+            job.update(bytes_downloaded=resume_position)
+            _note_advertised_sha256(response, advertised)
+            fd = _open_archive(job)
+            try:
+                if not resume_position:
+                    os.ftruncate(fd, 0)
+                if total_bytes:
+                    _preallocate(fd, total_bytes)
+                # A body fetched from the start is hashed as it is written; a resumed one is
+                # hashed from disk once complete.
+                digest = hashlib.sha256() if advertised and not resume_position else None
+                report = self._download_reporter(job)
+                offset = await self._write_body(job, response, fd, resume_position, report, digest=digest)
+                # Drop any preallocated tail if the body was shorter than advertised.
+                await asyncio.get_running_loop().run_in_executor(self._writer, os.ftruncate, fd, offset)
+            finally:
+                os.close(fd)
+            await self._verify_archive(job, advertised, digest)
+            report(final=True)
 
-        async with httpx.AsyncClient(timeout=None, follow_redirects=True) as client:
-            async with client.stream("GET", job.url, headers=headers) as response:
-                response.raise_for_status()
-                if resume_position and response.status_code != 206:
-                    # Server ignored the range request; restart from scratch
-                    resume_position = 0
-                    headers.pop("Range", None)
-                    if job.archive_path.exists():
-                        job.archive_path.unlink()
-                    job.update(bytes_downloaded=0)
-                    await self._persist_jobs()
-                total = response.headers.get("Content-Length")
-                if total is not None:
-                    total_bytes = int(total)
-                    if resume_position and response.status_code == 206:
-                        total_bytes += resume_position
-                else:
-                    total_bytes = None
-                job.set_total_bytes(total_bytes)
-                await self._persist_jobs()
-                if resume_position:
-                    job.update(bytes_downloaded=resume_position)
-                    await self._persist_jobs()
-                mode = "ab" if resume_position else "wb"
-                with open(job.archive_path, mode) as file_handle:
-                    async for chunk in response.aiter_bytes(config.DEFAULT_DOWNLOAD_CHUNK_SIZE):
-                        if not chunk:
-                            continue
-                        file_handle.write(chunk)
-                        job.bump_downloaded(len(chunk))
-                        detail = _format_download_detail(job)
-                        job.set_progress(job.progress, detail=detail)
-                        await asyncio.sleep(0)
+    async def _verify_archive(
+        self, job: Job, advertised: List[bytes], digest: Optional[hashlib._Hash] = None
+    ) -> None:
+        """Check the finished archive against the advertised SHA-256, if the server sent one.
 
-    async def _extract(self, job: Job) -> None:
-        job.set_stage("extracting", JobStatus.EXTRACTING, detail="Unpacking archive")
-        job.set_progress(0.0)
-        await self._persist_jobs()
-        await asyncio.to_thread(extract_archive, job)
-        job.set_progress(1.0, detail="Extraction complete")
-        await self._persist_jobs()
+        ``digest`` is the hash fed while streaming; without it the file is read back and hashed
+        on the writer thread, after every queued write.
+        """
 
-    async def _index(self, job: Job) -> None:
-        job.set_stage("indexing", JobStatus.INDEXING, detail="Creating search index")
-        job.set_progress(0.0)
-        await self._persist_jobs()
-        await asyncio.to_thread(indexer.build_index_for_job, job)
-        job.set_progress(1.0, detail="Indexing finished")
-        await self._persist_jobs()
+        if not advertised:
+            return
+        if digest is None:
+            loop = asyncio.get_running_loop()
+            digest = await loop.run_in_executor(self._writer, _hash_file, job.archive_path)
+        if digest.digest() != advertised[0]:
+            # Start the next attempt from scratch rather than resuming corrupt data.
+            job.update(segments=None, bytes_downloaded=0)
+            raise ValueError("Downloaded archive does not match the server's SHA-256 digest")
 
-    def _load_jobs(self) -> None:
-        if not self._jobs_file.exists():
+    def _http_client(self) -> httpx.AsyncClient:
+        """Return the client shared by every download, so retries reuse warm connections."""
+
+        if self._closed:
+            raise RuntimeError("Job manager has been shut down")
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=None,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=32),
+            )
+        return self._client
+
+    async def _plan_segments(self, client: httpx.AsyncClient, job: Job, advertised: List[bytes]) -> None:
+        """Split the download into byte ranges if the server advertises range support."""
+
+        try:
+            response = await client.head(job.url, headers=_REQUEST_HEADERS)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return  # Some signed URLs reject HEAD; the plain GET path still works.
+        _note_advertised_sha256(response, advertised)
+        if response.headers.get("Accept-Ranges", "").lower() != "bytes":
             return
         try:
-            raw = self._jobs_file.read_text(encoding="utf-8")
-        except OSError as exc:
-            logger.warning("Unable to read job persistence file %s: %s", self._jobs_file, exc)
+            total_bytes = int(response.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return
+        if total_bytes < _SEGMENTED_DOWNLOAD_MIN_BYTES:
             return
+        step = -(-total_bytes // config.DEFAULT_DOWNLOAD_CONNECTIONS)
+        segments = [[start, min(start + step, total_bytes)] for start in range(0, total_bytes, step)]
+        job.set_total_bytes(total_bytes)
+        job.update(bytes_downloaded=0, segments=segments)
+
+    async def _download_segments(self, client: httpx.AsyncClient, job: Job, advertised: List[bytes]) -> bool:
+        """Fetch the remaining ranges in parallel; return False if the server ignores ranges."""
+
+        fd = _open_archive(job)
         try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
-            logger.warning("Ignoring corrupt job persistence file %s", self._jobs_file)
+            _preallocate(fd, job.total_bytes)
+            report = self._download_reporter(job)
+            try:
+                async with asyncio.TaskGroup() as group:
+                    for index, (start, end) in enumerate(job.segments):
+                        if start < end:
+                            group.create_task(
+                                self._download_segment(client, job, fd, index, report, advertised)
+                            )
+            except ExceptionGroup as errors:
+                if any(isinstance(error, _RangeNotHonoured) for error in errors.exceptions):
+                    return False
+                # Surface the first failure as-is so the retry detail stays readable.
+                raise errors.exceptions[0] from None
+        finally:
+            os.close(fd)
+        if any(start != end for start, end in job.segments):
+            # Keep the segments so the next attempt only fetches what is still missing.
+            missing = sum(end - start for start, end in job.segments if start < end)
+            raise ValueError(f"Ranged download ended early; {missing} bytes still missing")
+        job.update(segments=None)
+        report(final=True)
+        return True
+
+    async def _download_segment(
+        self,
+        client: httpx.AsyncClient,
+        job: Job,
+        fd: int,
+        index: int,
+        report: Callable[..., None],
+        advertised: List[bytes],
+    ) -> None:
+        start, end = job.segments[index]
+        headers = {**_REQUEST_HEADERS, "Range": f"bytes={start}-{end - 1}"}
+        async with client.stream("GET", job.url, headers=headers) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise _RangeNotHonoured()
+            _check_content_range(response.headers.get("Content-Range"), start, end)
+            _note_advertised_sha256(response, advertised)
+            await self._write_body(job, response, fd, start, report, segment=index)
+
+    async def _write_body(
+        self,
+        job: Job,
+        response: httpx.Response,
+        fd: int,
+        offset: int,
+        report: Callable[..., None],
+        segment: Optional[int] = None,
+        digest: Optional[hashlib._Hash] = None,
+    ) -> int:
+        """Write the response body to ``fd`` from ``offset`` and return the end offset.
+
+        If ``digest`` is given it is fed each chunk on the writer thread, in body order.
+        """
+
+        loop = asyncio.get_running_loop()
+        # At most one write is in flight, so the next chunk is read from the network
+        # while the previous one is written out on the writer thread.
+        pending: Optional[asyncio.Future[None]] = None
+        pending_size = 0
+        # Without a chunk size httpx hands over network reads as they arrive; collecting them
+        # into reused buffers avoids joining them into a fresh 1 MiB bytes object per chunk.
+        chunks = _buffered_chunks(response.aiter_bytes(), config.DEFAULT_DOWNLOAD_CHUNK_SIZE)
+        try:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                if pending is not None:
+                    await pending
+                    # Only count bytes once they are on disk; resume relies on it.
+                    job.bump_downloaded(pending_size, segment)
+                pending = loop.run_in_executor(self._writer, _write_chunk, fd, chunk, offset, digest)
+                pending_size = len(chunk)
+                offset += pending_size
+                report()
+            if pending is not None:
+                await pending
+                job.bump_downloaded(pending_size, segment)
+                pending = None
+        finally:
+            if pending is not None:
+                # The stream failed; let the outstanding write finish before fd is closed.
+                with contextlib.suppress(Exception):
+                    await asyncio.shield(pending)
+        return offset
+
+    def _download_reporter(self, job: Job) -> Callable[..., None]:
+        """Return a callback that refreshes the download detail at most every interval.
+
+        Pass ``final=True`` to report regardless of the interval once the body is done.
+        """
+
+        total = job.total_bytes
+        # The total never changes mid-download, so format it once rather than per report.
+        total_text = human_readable_bytes(total) if total else None
+        last_report = time.monotonic()
+
+        def report(final: bool = False) -> None:
+            nonlocal last_report
+            now = time.monotonic()
+            if not final and now - last_report < _PROGRESS_INTERVAL_SECONDS:
+                return
+            last_report = now
+            # Plain int read: bytes_downloaded is only written on this event loop.
+            downloaded = job.bytes_downloaded
+            if total:
+                job.set_progress(
+                    min(downloaded / total, 1.0),
+                    detail=f"{human_readable_bytes(downloaded)} / {total_text}",
+                )
+            else:
+                job.set_progress(job.progress, detail=f"{human_readable_bytes(downloaded)} downloaded")
+
+        return report
+
+    async def _extract(self, job: Job) -> None:
+        if job.extracted_at is not None and job.extract_path.exists():
+            job.set_progress(1.0, detail="Archive already unpacked")
             return
-        if not isinstance(data, list):
-            logger.warning("Unexpected job persistence format in %s", self._jobs_file)
+        job.set_stage("extracting", JobStatus.EXTRACTING, detail="Unpacking archive", progress=0.0)
+        await self._workers.run(extract_archive, job.snapshot_for_worker())
+        job.update(extracted_at=datetime.utcnow())
+        job.set_progress(1.0, detail="Extraction complete")
+
+    async def _index(self, job: Job) -> None:
+        job.set_stage("indexing", JobStatus.INDEXING, detail="Creating search index", progress=0.0)
+        await self._workers.run(indexer.build_index_for_job, job.snapshot_for_worker())
+        job.set_progress(1.0, detail="Indexing finished")
+
+    def _apply_worker_progress(
+        self, job_id: str, stage: str, progress: Optional[float], detail: Optional[str]
+    ) -> None:
+        # Called on the relay thread. Reports that arrive after the job moved on to
+        # another stage are stale and dropped.
+        job = self._jobs.get(job_id)
+        if job is not None and job.stage == stage:
+            job.set_progress(progress, detail=detail)
+
+    def _job_info(self, job: Job) -> JobInfo:
+        # Read the revision first: if the job changes while the view is built, the cached
+        # entry is tagged with the older revision and simply rebuilt on the next call.
+        revision = job.revision
+        cached = self._info_cache.get(job.id)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        info = JobInfo.from_job(job)
+        self._info_cache[job.id] = (revision, info)
+        return info
+
+    def _job_json(self, job: Job) -> bytes:
+        revision = job.revision
+        cached = self._json_cache.get(job.id)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        payload = self._job_info(job).model_dump_json().encode("utf-8")
+        self._json_cache[job.id] = (revision, payload)
+        return payload
+
+    def _load_jobs(self) -> None:
+        data = self._read_job_snapshots()
+        if data is None:
             return
-        dirty = False
+        dirty = self._journal_file.exists()
         for item in data:
             try:
                 job = Job.from_snapshot(item)
@@ -224,60 +522,324 @@ class JobManager:
                     "failed",
                     JobStatus.FAILED,
                     detail="Missing source URL; cannot resume",
+                    message="Job missing source URL when restarting",
                 )
-                job.update(message="Job missing source URL when restarting")
                 dirty = True
                 continue
             self._resume_job_ids.append(job.id)
         if dirty:
             self._persist_jobs_sync()
+        else:
+            self._persisted = {job.id: job.snapshot() for job in self._jobs.values()}
+        for job in self._jobs.values():
+            job.on_change = self._job_changed
+
+    def _read_job_snapshots(self) -> Optional[List[dict[str, Any]]]:
+        """Return the compacted snapshots with any journalled changes replayed on top."""
+
+        records: Dict[str, dict[str, Any]] = {}
+        if self._jobs_file.exists():
+            try:
+                raw = self._jobs_file.read_bytes()
+            except OSError as exc:
+                logger.warning("Unable to read job persistence file %s: %s", self._jobs_file, exc)
+                return None
+            try:
+                data = load_json(raw)
+            except json.JSONDecodeError:
+                logger.warning("Ignoring corrupt job persistence file %s", self._jobs_file)
+                return None
+            if isinstance(data, dict):
+                self._generation = data.get("generation", 0)
+                data = data.get("jobs")
+            if not isinstance(data, list):
+                logger.warning("Unexpected job persistence format in %s", self._jobs_file)
+                return None
+            for item in data:
+                if isinstance(item, dict):
+                    records[item.get("id")] = item
+        if self._journal_file.exists():
+            try:
+                lines = self._journal_file.read_bytes().splitlines()
+            except OSError as exc:
+                logger.warning("Unable to read job journal %s: %s", self._journal_file, exc)
+                lines = []
+            for line in lines:
+                try:
+                    delta = load_json(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append; everything before it is intact.
+                    logger.warning("Skipping corrupt entry in job journal %s", self._journal_file)
+                    continue
+                if not isinstance(delta, dict):
+                    continue
+                if delta.pop("generation", 0) < self._generation:
+                    continue  # Already folded into jobs.json by a compaction that was cut short.
+                records.setdefault(delta.get("id"), {}).update(delta)
+        if not records and not self._jobs_file.exists():
+            return None
+        return list(records.values())
 
     async def _reconcile_startup_jobs(self) -> None:
-        async with self._lock:
-            jobs_to_resume = [
-                self._jobs[job_id] for job_id in self._resume_job_ids if job_id in self._jobs
-            ]
+        jobs_to_resume = [self._jobs[job_id] for job_id in self._resume_job_ids if job_id in self._jobs]
         if not jobs_to_resume:
             self._resume_job_ids.clear()
             return
         logger.info("Re-queuing %d job(s) interrupted by restart", len(jobs_to_resume))
         for job in jobs_to_resume:
-            job.set_stage("queued", JobStatus.PENDING, detail="Re-queued after restart")
-            job.set_progress(None)
-            job.update(message="Job automatically re-queued after restart")
-        await self._persist_jobs()
+            job.set_stage(
+                "queued",
+                JobStatus.PENDING,
+                detail="Re-queued after restart",
+                progress=None,
+                message="Job automatically re-queued after restart",
+            )
+        await self._compact_jobs()
         self._resume_job_ids.clear()
         for job in jobs_to_resume:
-            asyncio.create_task(self._run_job(job))
+            self._start_job(job)
+
+    def _job_changed(self) -> None:
+        """``Job.on_change`` hook: persist soon after any job mutation."""
+
+        if self._dirty_event.is_set():
+            return  # A persist is already pending and will pick this change up.
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Worker progress is applied on the relay thread; hop onto the event loop.
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._mark_dirty)
+            return
+        self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
+        """Schedule a coalesced persist of all job state."""
+
+        self._loop = asyncio.get_running_loop()
+        self._dirty_event.set()
+        if self._closed:
+            return  # shutdown() writes the final state itself.
+        if self._persister is None or self._persister.done():
+            self._persister = asyncio.create_task(self._run_persister())
+
+    async def _run_persister(self) -> None:
+        while True:
+            await self._dirty_event.wait()
+            self._dirty_event.clear()
+            # Let bursts of updates (progress ticks, stage changes) land before writing once.
+            await asyncio.sleep(_PERSIST_DEBOUNCE_SECONDS)
+            # Shielded so shutdown() cancelling the loop never interrupts a write in progress.
+            await asyncio.shield(self._persist_jobs())
 
     def _persist_jobs_sync(self) -> None:
         snapshots = [job.snapshot() for job in self._jobs.values()]
         try:
-            self._write_jobs_file(snapshots)
+            self._compact_jobs_file(snapshots)
         except OSError as exc:  # pragma: no cover - logs failure
             logger.error("Failed to synchronously persist jobs: %s", exc)
 
     async def _persist_jobs(self) -> None:
-        async with self._lock:
-            snapshots = [job.snapshot() for job in self._jobs.values()]
+        """Append the fields that changed since the last persist to the job journal."""
+
+        snapshots = [job.snapshot() for job in self._jobs.values()]
         async with self._storage_lock:
+            deltas = []
+            for snapshot in snapshots:
+                previous = self._persisted.get(snapshot["id"])
+                if previous is None:
+                    deltas.append(snapshot)
+                    continue
+                delta = {key: value for key, value in snapshot.items() if previous.get(key) != value}
+                if delta:
+                    delta["id"] = snapshot["id"]
+                    deltas.append(delta)
+            if not deltas:
+                return
+            previous_state = self._persisted
+            self._persisted = {snapshot["id"]: snapshot for snapshot in snapshots}
             try:
-                await asyncio.to_thread(self._write_jobs_file, snapshots)
+                if self._journal_entries + len(deltas) >= _JOURNAL_COMPACT_THRESHOLD:
+                    await asyncio.to_thread(self._compact_jobs_file, snapshots)
+                else:
+                    await asyncio.to_thread(self._append_journal, deltas)
             except OSError as exc:  # pragma: no cover - log only
+                self._persisted = previous_state
                 logger.error("Failed to persist jobs: %s", exc)
 
-    def _write_jobs_file(self, snapshots: List[dict[str, Any]]) -> None:
+    async def _compact_jobs(self) -> None:
+        snapshots = [job.snapshot() for job in self._jobs.values()]
+        async with self._storage_lock:
+            try:
+                await asyncio.to_thread(self._compact_jobs_file, snapshots)
+            except OSError as exc:  # pragma: no cover - log only
+                logger.error("Failed to compact jobs: %s", exc)
+
+    def _append_journal(self, deltas: List[dict[str, Any]]) -> None:
+        generation = self._generation
+        payload = b"".join(dump_json({**delta, "generation": generation}) + b"\n" for delta in deltas)
+        self._journal_file.parent.mkdir(parents=True, exist_ok=True)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+        fd = os.open(self._journal_file, flags, 0o644)
+        try:
+            _write_all(fd, payload)
+        finally:
+            os.close(fd)
+        self._journal_entries += len(deltas)
+
+    def _compact_jobs_file(self, snapshots: List[dict[str, Any]]) -> None:
+        """Rewrite ``jobs.json`` from full snapshots and start a fresh journal."""
+
         self._jobs_file.parent.mkdir(parents=True, exist_ok=True)
         tmp_file = self._jobs_file.with_suffix(self._jobs_file.suffix + ".tmp")
-        with tmp_file.open("w", encoding="utf-8") as handle:
-            json.dump(snapshots, handle, indent=2, sort_keys=True)
+        generation = self._generation + 1
+        tmp_file.write_bytes(dump_json({"generation": generation, "jobs": snapshots}))
         tmp_file.replace(self._jobs_file)
+        self._generation = generation
+        self._journal_file.unlink(missing_ok=True)
+        self._journal_entries = 0
+        self._persisted = {snapshot["id"]: snapshot for snapshot in snapshots}
 
 
-def _format_download_detail(job: Job) -> str:
-    with job.lock:
-        downloaded = job.bytes_downloaded
-        total = job.total_bytes
-    if total:
-        return f"{human_readable_bytes(downloaded)} / {human_readable_bytes(total)}"
-    return f"{human_readable_bytes(downloaded)} downloaded"
+def _is_client_error(exc: Exception) -> bool:
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return False
+    status = exc.response.status_code
+    # Timeouts and rate limiting are worth retrying; other 4xx responses are final.
+    return 400 <= status < 500 and status not in (408, 429)
+
+
+def _is_complete(job: Job, response: httpx.Response, resume_position: int) -> bool:
+    """Return whether a 416 for ``bytes=<resume_position>-`` means the archive is already whole."""
+
+    if not resume_position or job.archive_path.stat().st_size != resume_position:
+        return False
+    # An unsatisfiable range is answered with "bytes */<complete length>".
+    _, _, length = response.headers.get("Content-Range", "").rpartition("/")
+    return not length.isdigit() or int(length) == resume_position
+
+
+def _check_content_range(value: Optional[str], start: int, end: int) -> None:
+    """Reject a 206 whose ``Content-Range`` does not lie within ``[start, end)`` from ``start``.
+
+    A narrower range is allowed: the segment is left unfinished and fetched again on retry.
+    """
+
+    unit, _, spec = (value or "").partition(" ")
+    first, _, last = spec.partition("/")[0].partition("-")
+    try:
+        first_byte, last_byte = int(first), int(last)
+    except ValueError:
+        raise ValueError(f"Unusable Content-Range for bytes {start}-{end - 1}: {value!r}") from None
+    if unit.lower() != "bytes" or first_byte != start or not start <= last_byte < end:
+        raise ValueError(f"Server sent Content-Range {value!r} for bytes {start}-{end - 1}")
+
+
+def _open_archive(job: Job) -> int:
+    return os.open(job.archive_path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserve ``size`` bytes for the archive up front so the filesystem can lay it out contiguously."""
+
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass  # Filesystem without fallocate support; fall back to a sparse file.
+    if os.fstat(fd).st_size < size:
+        os.ftruncate(fd, size)
+
+
+async def _buffered_chunks(stream: AsyncIterator[bytes], size: int) -> AsyncIterator[memoryview]:
+    """Regroup ``stream`` into ``size``-byte views over two alternating, reused buffers.
+
+    A view's buffer is refilled once the view after it has been handed out, so the consumer
+    must be finished with each view before asking for the one after next. ``_write_body``
+    guarantees this by awaiting the previous write before submitting the next.
+    """
+
+    buffers = (memoryview(bytearray(size)), memoryview(bytearray(size)))
+    current = 0
+    view = buffers[current]
+    filled = 0
+    async for data in stream:
+        piece = memoryview(data)
+        while piece:
+            take = min(size - filled, len(piece))
+            view[filled : filled + take] = piece[:take]
+            filled += take
+            piece = piece[take:]
+            if filled == size:
+                yield view
+                current ^= 1
+                view = buffers[current]
+                filled = 0
+    if filled:
+        yield view[:filled]
+
+
+def _write_chunk(fd: int, data: bytes | memoryview, offset: int, digest: Optional[hashlib._Hash]) -> None:
+    _write_at(fd, data, offset)
+    if digest is not None:
+        digest.update(data)  # hashlib releases the GIL for large buffers
+
+
+def _note_advertised_sha256(response: httpx.Response, advertised: List[bytes]) -> None:
+    """Record the archive's advertised SHA-256 from ``response`` unless one is already known.
+
+    ``Repr-Digest`` covers the whole representation, so a 206 or HEAD carries the same value
+    as a full 200. Only undecoded bodies are checked; httpx decodes any Content-Encoding.
+    """
+
+    if advertised or "Content-Encoding" in response.headers:
+        return
+    expected = _advertised_sha256(response.headers)
+    if expected is not None:
+        advertised.append(expected)
+
+
+def _hash_file(path: Path) -> hashlib._Hash:
+    with open(path, "rb") as handle:
+        return hashlib.file_digest(handle, "sha256")
+
+
+def _advertised_sha256(headers: httpx.Headers) -> Optional[bytes]:
+    """Return the SHA-256 from a ``Repr-Digest`` (RFC 9530) or legacy ``Digest`` header."""
+
+    for name in ("Repr-Digest", "Digest"):
+        value = headers.get(name)
+        if not value:
+            continue
+        for item in value.split(","):
+            algorithm, _, encoded = item.strip().partition("=")
+            if algorithm.lower() != "sha-256":
+                continue
+            try:
+                return base64.b64decode(encoded.strip().strip(":"), validate=True)
+            except binascii.Error:
+                return None
+    return None
+
+
+def _write_at(fd: int, data: bytes | memoryview, offset: int) -> None:
+    # Deliberately pwrite rather than an mmap of the archive: a 1 MiB pwrite releases the GIL
+    # for the whole copy, whereas assigning into a mapping holds it through the copy and one page
+    # fault per 4 KiB, and a full disk surfaces as SIGBUS instead of an OSError we can retry.
+    if not hasattr(os, "pwrite"):  # pragma: no cover - Windows
+        os.lseek(fd, offset, os.SEEK_SET)
+        _write_all(fd, data)
+        return
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
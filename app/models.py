@@ -6,11 +6,18 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 import threading
+import time
 
 from pydantic import BaseModel
 
+from .workers import WorkerJob
+
+
+# Distinguishes "leave unchanged" from an explicit ``None`` in keyword arguments.
+_UNSET = object()
+
 
 class JobStatus(str, Enum):
     """Lifecycle states for a backup ingestion job."""
@@ -42,8 +49,26 @@ class Job:
     total_bytes: Optional[int] = None
     message: Optional[str] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    # Kept as epoch seconds because it is refreshed on every mutation; see ``updated_at``.
+    updated_ts: float = field(default_factory=time.time, repr=False)
+    extracted_at: Optional[datetime] = None
+    # ``[next_offset, end)`` of each byte range still being fetched by a segmented download.
+    segments: Optional[List[List[int]]] = None
     lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    # Bumped on every mutation so readers can tell whether a cached view is stale.
+    revision: int = field(default=0, repr=False, compare=False)
+    # Called after every mutation, possibly from a worker-progress thread.
+    on_change: Optional[Callable[[], None]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def updated_at(self) -> datetime:
+        """When the job last changed, as a naive UTC datetime like ``created_at``."""
+
+        return datetime.fromtimestamp(self.updated_ts, timezone.utc).replace(tzinfo=None)
+
+    @updated_at.setter
+    def updated_at(self, value: datetime) -> None:
+        self.updated_ts = _epoch_seconds(value)
 
     def update(self, **fields: Any) -> None:
         """Safely update fields on the job."""
@@ -53,39 +78,98 @@ class Job:
                 if not hasattr(self, key):
                     raise AttributeError(f"Job has no attribute '{key}'")
                 setattr(self, key, value)
-            self.updated_at = datetime.utcnow()
+            self.updated_ts = time.time()
+            self.revision += 1
+        self._notify()
 
     def set_total_bytes(self, total: Optional[int]) -> None:
         with self.lock:
             self.total_bytes = total
             self.progress = (self.bytes_downloaded / total) if total else None
-            self.updated_at = datetime.utcnow()
+            self.updated_ts = time.time()
+            self.revision += 1
+        self._notify()
 
-    def bump_downloaded(self, amount: int) -> None:
-        with self.lock:
-            self.bytes_downloaded += amount
-            if self.total_bytes:
-                self.progress = min(self.bytes_downloaded / self.total_bytes, 1.0)
-            self.updated_at = datetime.utcnow()
+    def bump_downloaded(self, amount: int, segment: Optional[int] = None) -> None:
+        """Account for ``amount`` more bytes on disk.
+
+        Called once per chunk, and only ever from the event loop, so it skips the lock;
+        ``updated_at`` is refreshed when the download loop next reports progress.
+        """
+
+        self.bytes_downloaded += amount
+        if segment is not None:
+            self.segments[segment][0] += amount
+        if self.total_bytes:
+            self.progress = min(self.bytes_downloaded / self.total_bytes, 1.0)
+        self.revision += 1
+        self._notify()
 
     def set_progress(self, progress: Optional[float], detail: Optional[str] = None) -> None:
         with self.lock:
             self.progress = progress
             if detail is not None:
                 self.stage_detail = detail
-            self.updated_at = datetime.utcnow()
+            self.updated_ts = time.time()
+            self.revision += 1
+        self._notify()
+
+    def set_stage(
+        self,
+        stage: str,
+        status: Optional[JobStatus] = None,
+        detail: Optional[str] = None,
+        progress: Optional[float] | object = _UNSET,
+        message: Optional[str] = None,
+    ) -> None:
+        """Move to ``stage``, applying the accompanying field changes as one update."""
 
-    def set_stage(self, stage: str, status: Optional[JobStatus] = None, detail: Optional[str] = None) -> None:
         with self.lock:
             self.stage = stage
             if status is not None:
                 self.status = status
             if detail is not None:
                 self.stage_detail = detail
-            self.updated_at = datetime.utcnow()
+            if progress is not _UNSET:
+                self.progress = progress
+            if message is not None:
+                self.message = message
+            self.updated_ts = time.time()
+            self.revision += 1
+        self._notify()
+
+    def _notify(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
+
+    def snapshot_for_worker(self) -> WorkerJob:
+        """Return the picklable subset of the job needed by worker processes."""
+
+        with self.lock:
+            return WorkerJob(
+                id=self.id,
+                stage=self.stage,
+                archive_path=self.archive_path,
+                extract_path=self.extract_path,
+                index_path=self.index_path,
+            )
+
+    def snapshot_native(self) -> Dict[str, Any]:
+        """Like :meth:`snapshot`, but with a ``JobStatus`` and timezone-aware timestamps."""
+
+        snapshot = self.snapshot()
+        del snapshot["segments"]  # Download bookkeeping, not part of the public view.
+        snapshot["status"] = JobStatus(snapshot["status"])
+        snapshot["created_at"] = _as_utc(snapshot["created_at"])
+        if snapshot["extracted_at"] is not None:
+            snapshot["extracted_at"] = _as_utc(snapshot["extracted_at"])
+        return snapshot
 
     def snapshot(self) -> Dict[str, Any]:
-        """Return a serialisable snapshot of the job state."""
+        """Return a snapshot of the job state for persisting with :func:`~app.utils.dump_json`.
+
+        Timestamps stay ``datetime`` objects; orjson encodes them natively as ISO 8601 UTC.
+        """
 
         with self.lock:
             return {
@@ -101,8 +185,10 @@ class Job:
                 "archive_path": str(self.archive_path),
                 "extract_path": str(self.extract_path),
                 "index_path": str(self.index_path),
-                "created_at": _format_iso8601(self.created_at),
-                "updated_at": _format_iso8601(self.updated_at),
+                "created_at": self.created_at,
+                "updated_at": datetime.fromtimestamp(self.updated_ts, timezone.utc),
+                "extracted_at": self.extracted_at,
+                "segments": [list(segment) for segment in self.segments] if self.segments else None,
             }
 
     @classmethod
@@ -110,7 +196,8 @@ class Job:
         """Restore a job instance from a serialised snapshot."""
 
         created_at = _parse_iso8601(data["created_at"])
-        updated_at = _parse_iso8601(data["updated_at"])
+        updated_ts = _epoch_seconds(_parse_iso8601(data["updated_at"]))
+        extracted_at = data.get("extracted_at")
         return cls(
             id=data["id"],
             url=data["url"],
@@ -125,7 +212,9 @@ class Job:
             extract_path=Path(data["extract_path"]),
             index_path=Path(data["index_path"]),
             created_at=created_at,
-            updated_at=updated_at,
+            updated_ts=updated_ts,
+            extracted_at=_parse_iso8601(extracted_at) if extracted_at else None,
+            segments=data.get("segments"),
         )
 
 
@@ -146,28 +235,12 @@ class JobInfo(BaseModel):
     index_path: str
     created_at: datetime
     updated_at: datetime
+    extracted_at: Optional[datetime] = None
 
     @classmethod
     def from_job(cls, job: Job) -> "JobInfo":
-        data = job.snapshot()
-        created_at = _parse_iso8601(data["created_at"])
-        updated_at = _parse_iso8601(data["updated_at"])
-        return cls(
-            id=data["id"],
-            url=data["url"],
-            status=JobStatus(data["status"]),
-            stage=data["stage"],
-            stage_detail=data["stage_detail"],
-            progress=data["progress"],
-            bytes_downloaded=data["bytes_downloaded"],
-            total_bytes=data["total_bytes"],
-            message=data["message"],
-            archive_path=data["archive_path"],
-            extract_path=data["extract_path"],
-            index_path=data["index_path"],
-            created_at=created_at,
-            updated_at=updated_at,
-        )
+        # model_construct looks cheaper but runs in Python; validating in pydantic-core is faster.
+        return cls.model_validate(job.snapshot_native())
 
 
 def _parse_iso8601(value: str) -> datetime:
@@ -176,7 +249,10 @@ def _parse_iso8601(value: str) -> datetime:
     return datetime.fromisoformat(value)
 
 
-def _format_iso8601(value: datetime) -> str:
-    if value.tzinfo is None:
-        return value.isoformat() + "Z"
-    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+def _as_utc(value: datetime) -> datetime:
+    # Naive datetimes in this module are UTC, not local time.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _epoch_seconds(value: datetime) -> float:
+    return _as_utc(value).timestamp()
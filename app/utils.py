@@ -2,16 +2,35 @@
 
 from __future__ import annotations
 
+from typing import Any
+
+import orjson
+
+
+_UNITS = ("B", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB")
+
 
 def human_readable_bytes(value: int, precision: int = 1) -> str:
     """Format a byte count as a human readable string."""
 
     if value < 1024:
         return f"{value} B"
-    units = ["KiB", "MiB", "GiB", "TiB", "PiB"]
-    scaled = float(value)
-    for unit in units:
-        scaled /= 1024.0
-        if scaled < 1024.0:
-            return f"{scaled:.{precision}f} {unit}"
-    return f"{scaled:.{precision}f} EiB"
+    # Each unit spans ten bits, so the bit length picks the unit without a division loop.
+    index = min((value.bit_length() - 1) // 10, len(_UNITS) - 1)
+    return "%.*f %s" % (precision, value / (1 << (index * 10)), _UNITS[index])
+
+
+# Naive datetimes are UTC throughout the app; emit them with a trailing "Z".
+_DUMP_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def dump_json(value: Any) -> bytes:
+    """Serialise ``value`` to compact JSON bytes."""
+
+    return orjson.dumps(value, option=_DUMP_OPTIONS)
+
+
+def load_json(data: bytes) -> Any:
+    """Parse JSON bytes."""
+
+    return orjson.loads(data)
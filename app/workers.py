@@ -0,0 +1,125 @@
+"""Process-pool plumbing for the CPU-bound extraction and indexing stages."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Set in each worker process by ``_initialise_worker``.
+_progress_queue: Optional["multiprocessing.Queue"] = None
+
+
+@dataclass(frozen=True)
+class WorkerJob:
+    """Picklable view of a job handed to worker processes.
+
+    Carries only the paths a stage needs; progress reports are forwarded to the
+    parent process, which applies them to the real ``Job``.
+    """
+
+    id: str
+    stage: str
+    archive_path: Path
+    extract_path: Path
+    index_path: Path
+
+    def set_progress(self, progress: Optional[float], detail: Optional[str] = None) -> None:
+        if _progress_queue is not None:
+            _progress_queue.put((self.id, self.stage, progress, detail))
+
+
+ProgressHandler = Callable[[str, str, Optional[float], Optional[str]], None]
+
+
+class WorkerPool:
+    """A lazily started process pool plus the thread relaying worker progress."""
+
+    def __init__(self, handle_progress: ProgressHandler) -> None:
+        self._handle_progress = handle_progress
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue: Optional["multiprocessing.Queue"] = None
+        self._relay: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Worker pool has been shut down")
+            if self._executor is None:
+                # Spawned workers do not inherit the parent's threads or event loop.
+                context = multiprocessing.get_context("spawn")
+                if self._queue is None:
+                    self._queue = context.Queue()
+                    self._relay = threading.Thread(
+                        target=self._relay_progress, name="worker-progress", daemon=True
+                    )
+                    self._relay.start()
+                self._executor = ProcessPoolExecutor(
+                    mp_context=context,
+                    initializer=_initialise_worker,
+                    initargs=(self._queue,),
+                )
+            return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in a worker process.
+
+        A worker that dies (OOM killer, crashing extension) breaks the whole pool, so a broken
+        pool is discarded and the next call starts a fresh one.
+        """
+
+        executor = self.executor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                return  # Another caller already replaced it.
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            executor, queue, relay = self._executor, self._queue, self._relay
+            self._executor = self._queue = self._relay = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if queue is None:
+            return
+        queue.put(None)
+        relay.join()
+        queue.close()
+
+    def _relay_progress(self) -> None:
+        queue = self._queue
+        while True:
+            message = queue.get()
+            if message is None:
+                return
+            try:
+                self._handle_progress(*message)
+            except Exception:  # pragma: no cover - keep relaying
+                logger.exception("Failed to apply worker progress update")
+
+
+def _initialise_worker(queue: "multiprocessing.Queue") -> None:
+    global _progress_queue
+    _progress_queue = queue
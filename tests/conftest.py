@@ -4,7 +4,47 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from typing import Any, Callable
+
+import pytest
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from app import config  # noqa: E402
+from app.models import Job  # noqa: E402
+
+
+@pytest.fixture
+def isolated_data_dir(tmp_path, monkeypatch) -> Path:
+    data_dir = tmp_path / "data"
+    downloads = data_dir / "downloads"
+    extracted = data_dir / "extracted"
+    indexes = data_dir / "indexes"
+    tmp_dir = data_dir / "tmp"
+    for path in (data_dir, downloads, extracted, indexes, tmp_dir):
+        path.mkdir(parents=True, exist_ok=True)
+    monkeypatch.setattr(config, "DATA_DIR", data_dir)
+    monkeypatch.setattr(config, "DOWNLOAD_DIR", downloads)
+    monkeypatch.setattr(config, "EXTRACT_DIR", extracted)
+    monkeypatch.setattr(config, "INDEX_DIR", indexes)
+    monkeypatch.setattr(config, "TMP_DIR", tmp_dir)
+    return data_dir
+
+
+@pytest.fixture
+def make_job(isolated_data_dir: Path) -> Callable[..., Job]:
+    """Return a factory for jobs whose files live under the isolated data directory."""
+
+    def factory(job_id: str, **fields: Any) -> Job:
+        fields.setdefault("url", "https://example.com/archive.zip")
+        return Job(
+            id=job_id,
+            archive_path=config.DOWNLOAD_DIR / f"{job_id}.zip",
+            extract_path=config.EXTRACT_DIR / job_id,
+            index_path=config.INDEX_DIR / f"{job_id}.sqlite3",
+            **fields,
+        )
+
+    return factory
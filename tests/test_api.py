@@ -0,0 +1,69 @@
+"""Tests for the JSON API endpoints."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import indexer
+from app.main import app, get_manager
+from app.manager import JobManager
+from app.models import JobStatus
+
+
+@pytest.fixture
+def manager(make_job) -> JobManager:
+    job_manager = JobManager()
+    job_manager._jobs["job1"] = make_job(
+        "job1",
+        status=JobStatus.DOWNLOADING,
+        stage="downloading",
+        progress=0.25,
+    )
+    app.dependency_overrides[get_manager] = lambda: job_manager
+    yield job_manager
+    app.dependency_overrides.clear()
+
+
+def test_api_lists_and_fetches_jobs(manager: JobManager) -> None:
+    client = TestClient(app)
+
+    response = client.get("/api/jobs")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    jobs = response.json()
+    assert [job["id"] for job in jobs] == ["job1"]
+    assert jobs[0]["status"] == "downloading"
+    assert jobs[0]["progress"] == 0.25
+
+    manager._jobs["job1"].set_progress(0.5)
+    assert client.get("/api/jobs/job1").json()["progress"] == 0.5
+    assert client.get("/api/jobs/missing").status_code == 404
+
+
+def test_api_search_requires_completed_job(manager: JobManager) -> None:
+    client = TestClient(app)
+
+    response = client.get("/api/jobs/job1/search", params={"q": "tomatoes"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Job has not completed indexing yet"}
+
+
+def test_api_search_returns_matches(manager: JobManager) -> None:
+    job = manager._jobs["job1"]
+    job.extract_path.mkdir()
+    (job.extract_path / "notes.md").write_text("Prune the tomatoes in spring", encoding="utf-8")
+    indexer.build_index(job.extract_path, job.index_path)
+    job.set_stage("completed", JobStatus.COMPLETED)
+    client = TestClient(app)
+
+    response = client.get("/api/jobs/job1/search", params={"q": "tomatoes"})
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "conversation_id": "notes.md",
+            "title": "notes.md",
+            "timestamp": "",
+            "snippet": "Prune the [tomatoes] in spring",
+        }
+    ]
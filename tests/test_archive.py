@@ -0,0 +1,84 @@
+"""Tests for archive extraction."""
+
+from __future__ import annotations
+
+from zipfile import ZipFile
+
+import pytest
+
+from app import archive as archive_module
+from app.archive import extract_archive
+
+
+def test_extract_archive_unpacks_all_members(make_job) -> None:
+    job = make_job("job")
+    with ZipFile(job.archive_path, "w") as archive:
+        archive.writestr("conversations.json", "[]")
+        archive.writestr("assets/", "")
+        for number in range(25):
+            archive.writestr(f"assets/file-{number}.txt", f"payload {number}" * 1000)
+    job.extract_path.mkdir()
+    (job.extract_path / "stale.txt").write_text("left over", encoding="utf-8")
+
+    extract_archive(job)
+
+    assert (job.extract_path / "conversations.json").read_text(encoding="utf-8") == "[]"
+    assert not (job.extract_path / "stale.txt").exists()
+    for number in range(25):
+        content = (job.extract_path / "assets" / f"file-{number}.txt").read_text(encoding="utf-8")
+        assert content == f"payload {number}" * 1000
+    assert job.progress == 1.0
+    assert job.stage_detail == "Extracted 27/27 entries"
+
+
+def test_extract_archive_rejects_path_traversal(make_job) -> None:
+    job = make_job("job")
+    with ZipFile(job.archive_path, "w") as archive:
+        archive.writestr("../escape.txt", "nope")
+
+    with pytest.raises(ValueError):
+        extract_archive(job)
+
+    assert not (job.extract_path.parent / "escape.txt").exists()
+
+
+def test_extract_archive_copies_large_members_in_chunks(make_job, monkeypatch) -> None:
+    job = make_job("job")
+    payload = bytes(range(256)) * 4096 * 3  # 3 MiB
+    with ZipFile(job.archive_path, "w") as archive:
+        archive.writestr("large.bin", payload)
+
+    reads: list[int] = []
+    real_open = ZipFile.open
+
+    def tracking_open(self, *args, **kwargs):
+        handle = real_open(self, *args, **kwargs)
+        real_read = handle.read
+
+        def read(size: int = -1) -> bytes:
+            reads.append(size)
+            return real_read(size)
+
+        handle.read = read
+        return handle
+
+    monkeypatch.setattr(ZipFile, "open", tracking_open)
+    extract_archive(job)
+
+    assert (job.extract_path / "large.bin").read_bytes() == payload
+    assert reads and all(0 < size <= archive_module._COPY_BUFFER_SIZE for size in reads)
+
+
+def test_extract_archive_reports_progress_in_order(make_job, monkeypatch) -> None:
+    monkeypatch.setattr(archive_module, "_PROGRESS_INTERVAL", 1)
+    job = make_job("job")
+    with ZipFile(job.archive_path, "w") as archive:
+        for number in range(200):
+            archive.writestr(f"file-{number}.txt", "x" * 100)
+    reported: list[float] = []
+    job.set_progress = lambda progress, detail=None: reported.append(progress)
+
+    extract_archive(job)
+
+    assert reported == sorted(reported)
+    assert reported[-1] == 1.0
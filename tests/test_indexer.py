@@ -0,0 +1,123 @@
+"""Tests for building and querying the search index."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app import indexer
+
+
+def _conversation(conv_id: str, title: str, text: str) -> dict:
+    return {
+        "id": conv_id,
+        "title": title,
+        "create_time": 1700000000.5,
+        "mapping": {
+            "root": {"message": None},
+            "node": {
+                "message": {
+                    "author": {"role": "user"},
+                    "create_time": 1700000001.0,
+                    "content": {"parts": [text]},
+                }
+            },
+        },
+    }
+
+
+@pytest.mark.parametrize("wrap", [False, True])
+def test_build_index_streams_conversations(tmp_path: Path, wrap: bool) -> None:
+    conversations = [
+        _conversation("a", "Gardening", "How do I prune tomatoes?"),
+        _conversation("b", "Cooking", "Best way to roast peppers"),
+    ]
+    payload = {"conversations": conversations} if wrap else conversations
+    extracted = tmp_path / "extracted"
+    extracted.mkdir()
+    (extracted / "conversations.json").write_text(json.dumps(payload), encoding="utf-8")
+    index_path = tmp_path / "index.sqlite3"
+
+    indexer.build_index(extracted, index_path)
+
+    results = indexer.query_index(index_path, "tomatoes")
+    assert [item["conversation_id"] for item in results] == ["a"]
+    assert results[0]["title"] == "Gardening"
+    assert "[tomatoes]" in results[0]["snippet"]
+
+
+def test_build_index_falls_back_to_text_documents(tmp_path: Path) -> None:
+    extracted = tmp_path / "extracted"
+    (extracted / "notes").mkdir(parents=True)
+    (extracted / "notes" / "ideas.md").write_text("Plant basil next to tomatoes", encoding="utf-8")
+    (extracted / "image.png").write_bytes(b"\x89PNG tomatoes")
+    index_path = tmp_path / "index.sqlite3"
+
+    indexer.build_index(extracted, index_path)
+
+    results = indexer.query_index(index_path, "basil")
+    assert [item["conversation_id"] for item in results] == [str(Path("notes") / "ideas.md")]
+    assert results[0]["title"] == "ideas.md"
+    assert indexer.query_index(index_path, "png") == []
+
+
+def test_build_index_tolerates_non_utf8_text_documents(tmp_path: Path) -> None:
+    extracted = tmp_path / "extracted"
+    extracted.mkdir()
+    (extracted / "notes.txt").write_bytes("Café notes about tomatoes".encode("latin-1"))
+    index_path = tmp_path / "index.sqlite3"
+
+    indexer.build_index(extracted, index_path)
+
+    results = indexer.query_index(index_path, "tomatoes")
+    assert [item["conversation_id"] for item in results] == ["notes.txt"]
+    assert "Caf\ufffd" in results[0]["snippet"]
+
+
+def test_build_index_replaces_previous_contents(tmp_path: Path) -> None:
+    extracted = tmp_path / "extracted"
+    extracted.mkdir()
+    conversation_file = extracted / "conversations.json"
+    index_path = tmp_path / "index.sqlite3"
+
+    conversation_file.write_text(json.dumps([_conversation("old", "Old", "tomatoes")]), encoding="utf-8")
+    indexer.build_index(extracted, index_path)
+    conversation_file.write_text(json.dumps([_conversation("new", "New", "tomatoes")]), encoding="utf-8")
+    indexer.build_index(extracted, index_path)
+
+    results = indexer.query_index(index_path, "tomatoes")
+    assert [item["conversation_id"] for item in results] == ["new"]
+
+
+def test_build_index_replaces_corrupt_index(tmp_path: Path) -> None:
+    # What a build killed mid-write leaves behind when journaling is off.
+    extracted = tmp_path / "extracted"
+    extracted.mkdir()
+    (extracted / "conversations.json").write_text(
+        json.dumps([_conversation("a", "Gardening", "tomatoes")]), encoding="utf-8"
+    )
+    index_path = tmp_path / "index.sqlite3"
+    index_path.write_bytes(b"SQLite format 3\x00" + b"\xff" * 8192)
+
+    indexer.build_index(extracted, index_path)
+
+    assert [item["conversation_id"] for item in indexer.query_index(index_path, "tomatoes")] == ["a"]
+    assert not (tmp_path / "index.sqlite3.tmp").exists()
+
+
+def test_search_matches_timestamps_and_supports_phrases(tmp_path: Path) -> None:
+    extracted = tmp_path / "extracted"
+    extracted.mkdir()
+    conversation = _conversation("a", "Gardening", "How do I prune tomatoes?")
+    (extracted / "conversations.json").write_text(json.dumps([conversation]), encoding="utf-8")
+    index_path = tmp_path / "index.sqlite3"
+
+    indexer.build_index(extracted, index_path)
+
+    assert [item["conversation_id"] for item in indexer.query_index(index_path, "2023")] == ["a"]
+    assert [item["conversation_id"] for item in indexer.query_index(index_path, "timestamp:2023")] == ["a"]
+    results = indexer.query_index(index_path, '"prune tomatoes"')
+    assert [item["conversation_id"] for item in results] == ["a"]
+    assert results[0]["timestamp"] == "2023-11-14T22:13:20+00:00"
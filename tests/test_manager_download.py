@@ -0,0 +1,336 @@
+"""Tests for JobManager archive downloads."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+
+import httpx
+import pytest
+
+from app import config, manager as manager_module
+from app.manager import JobManager
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+
+
+@pytest.fixture
+def response_headers() -> dict[str, str]:
+    """Extra headers sent with every response, HEAD included; tests may add to it."""
+
+    return {}
+
+
+@pytest.fixture
+def served_requests(monkeypatch, response_headers) -> list[httpx.Request]:
+    """Serve PAYLOAD (honouring Range headers) to every AsyncClient."""
+
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.method == "HEAD":
+            headers = {"Content-Length": str(len(PAYLOAD)), "Accept-Ranges": "bytes", **response_headers}
+            return httpx.Response(200, headers=headers)
+        range_header = request.headers.get("Range")
+        if range_header:
+            start_text, _, end_text = range_header.removeprefix("bytes=").partition("-")
+            start = int(start_text)
+            if start >= len(PAYLOAD):
+                return httpx.Response(416, headers={"Content-Range": f"bytes */{len(PAYLOAD)}"})
+            end = int(end_text) if end_text else len(PAYLOAD) - 1
+            body = PAYLOAD[start : end + 1]
+            headers = {"Content-Range": f"bytes {start}-{end}/{len(PAYLOAD)}", **response_headers}
+            return httpx.Response(206, content=body, headers=headers)
+        return httpx.Response(200, content=PAYLOAD, headers=response_headers)
+
+    real_client = httpx.AsyncClient
+
+    def client_factory(*args, **kwargs) -> httpx.AsyncClient:
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", client_factory)
+    return requests
+
+
+def test_download_writes_archive(make_job, served_requests) -> None:
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("fresh")
+        await manager._download(job)
+
+        assert job.archive_path.read_bytes() == PAYLOAD
+        assert job.bytes_downloaded == len(PAYLOAD)
+        assert job.total_bytes == len(PAYLOAD)
+        assert job.progress == 1.0
+        assert job.stage_detail == "1.0 MiB / 1.0 MiB"
+
+    asyncio.run(run())
+
+
+def test_download_pipelines_small_chunks(make_job, served_requests, monkeypatch) -> None:
+    # Many chunks cycle through both reused buffers while earlier writes are still in flight.
+    monkeypatch.setattr(config, "DEFAULT_DOWNLOAD_CHUNK_SIZE", 100_000)
+
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("small-chunks")
+        await manager._download(job)
+
+        assert job.archive_path.read_bytes() == PAYLOAD
+        assert job.bytes_downloaded == len(PAYLOAD)
+
+    asyncio.run(run())
+
+
+def test_download_resumes_partial_archive(make_job, served_requests) -> None:
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("partial")
+        job.archive_path.write_bytes(PAYLOAD[:1000])
+        job.update(bytes_downloaded=1000)
+        await manager._download(job)
+
+        assert served_requests[0].headers["Range"] == "bytes=1000-"
+        assert job.archive_path.read_bytes() == PAYLOAD
+        assert job.bytes_downloaded == len(PAYLOAD)
+
+    asyncio.run(run())
+
+
+def test_download_resumes_preallocated_archive(make_job, served_requests) -> None:
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("preallocated")
+        job.archive_path.write_bytes(PAYLOAD[:4096] + bytes(len(PAYLOAD) - 4096))
+        job.update(bytes_downloaded=4096, total_bytes=len(PAYLOAD))
+        await manager._download(job)
+
+        assert served_requests[0].headers["Range"] == "bytes=4096-"
+        assert job.archive_path.read_bytes() == PAYLOAD
+
+    asyncio.run(run())
+
+
+def test_download_skips_complete_archive(make_job, served_requests) -> None:
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("complete", bytes_downloaded=len(PAYLOAD), total_bytes=len(PAYLOAD))
+        job.archive_path.write_bytes(PAYLOAD)
+        await manager._download(job)
+
+        assert served_requests == []
+        assert job.archive_path.read_bytes() == PAYLOAD
+
+    asyncio.run(run())
+
+
+def test_download_treats_unsatisfiable_resume_as_complete(make_job, served_requests) -> None:
+    # Without a known total the early return cannot fire, so the resume request gets a 416.
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("complete-unknown-size", bytes_downloaded=len(PAYLOAD))
+        job.archive_path.write_bytes(PAYLOAD)
+        await manager._download(job)
+
+        assert [request.headers["Range"] for request in served_requests] == [f"bytes={len(PAYLOAD)}-"]
+        assert job.archive_path.read_bytes() == PAYLOAD
+        assert job.total_bytes == len(PAYLOAD)
+        assert job.progress == 1.0
+
+    asyncio.run(run())
+
+
+def test_download_fetches_ranges_in_parallel(make_job, served_requests, monkeypatch) -> None:
+    monkeypatch.setattr(manager_module, "_SEGMENTED_DOWNLOAD_MIN_BYTES", 0)
+
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("segmented")
+        await manager._download(job)
+
+        ranges = sorted(
+            request.headers["Range"] for request in served_requests if request.method == "GET"
+        )
+        assert len(ranges) == config.DEFAULT_DOWNLOAD_CONNECTIONS
+        assert "bytes=0-174762" in ranges
+        assert job.archive_path.read_bytes() == PAYLOAD
+        assert job.bytes_downloaded == len(PAYLOAD)
+        assert job.segments is None
+        assert job.stage_detail == "1.0 MiB / 1.0 MiB"
+
+    asyncio.run(run())
+
+
+def test_download_resumes_unfinished_segments(make_job, served_requests) -> None:
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("segments")
+        half = len(PAYLOAD) // 2
+        job.archive_path.write_bytes(PAYLOAD[:100] + bytes(half - 100) + PAYLOAD[half:half + 200] + bytes(half - 200))
+        job.update(
+            bytes_downloaded=300,
+            total_bytes=len(PAYLOAD),
+            segments=[[100, half], [half + 200, len(PAYLOAD)]],
+        )
+        await manager._download(job)
+
+        assert [request.headers["Range"] for request in served_requests] == [
+            f"bytes=100-{half - 1}",
+            f"bytes={half + 200}-{len(PAYLOAD) - 1}",
+        ]
+        assert job.archive_path.read_bytes() == PAYLOAD
+        assert job.bytes_downloaded == len(PAYLOAD)
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("narrow_range", [False, True])
+def test_download_retries_short_segments(make_job, monkeypatch, narrow_range: bool) -> None:
+    monkeypatch.setattr(manager_module, "_SEGMENTED_DOWNLOAD_MIN_BYTES", 0)
+    ranges: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "HEAD":
+            headers = {"Content-Length": str(len(PAYLOAD)), "Accept-Ranges": "bytes"}
+            return httpx.Response(200, headers=headers)
+        ranges.append(request.headers["Range"])
+        start_text, _, end_text = request.headers["Range"].removeprefix("bytes=").partition("-")
+        start, end = int(start_text), int(end_text)
+        if start == 0 and len(ranges) <= config.DEFAULT_DOWNLOAD_CONNECTIONS:
+            # The first segment is cut short on the first attempt only.
+            body = PAYLOAD[: (end + 1) // 2]
+            if narrow_range:
+                end = len(body) - 1
+        else:
+            body = PAYLOAD[start : end + 1]
+        headers = {"Content-Range": f"bytes {start}-{end}/{len(PAYLOAD)}"}
+        return httpx.Response(206, content=body, headers=headers)
+
+    real_client = httpx.AsyncClient
+
+    def client_factory(*args, **kwargs) -> httpx.AsyncClient:
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", client_factory)
+
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("short-segment")
+        with pytest.raises(ValueError, match="bytes still missing"):
+            await manager._stream_download(job)
+        assert job.segments is not None
+
+        ranges.clear()
+        await manager._stream_download(job)
+
+        assert ranges == ["bytes=87381-174762"]
+        assert job.archive_path.read_bytes() == PAYLOAD
+        assert job.bytes_downloaded == len(PAYLOAD)
+        assert job.segments is None
+
+    asyncio.run(run())
+
+
+def test_download_verifies_advertised_digest(
+    make_job, served_requests, response_headers
+) -> None:
+    digest = base64.b64encode(hashlib.sha256(PAYLOAD).digest()).decode()
+    response_headers["Repr-Digest"] = f"sha-256=:{digest}:"
+
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("verified")
+        await manager._stream_download(job)
+
+        assert job.archive_path.read_bytes() == PAYLOAD
+
+    asyncio.run(run())
+
+
+def test_download_rejects_digest_mismatch(
+    make_job, served_requests, response_headers
+) -> None:
+    digest = base64.b64encode(hashlib.sha256(b"something else").digest()).decode()
+    response_headers["Digest"] = f"SHA-256={digest}"
+
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("corrupt")
+        with pytest.raises(ValueError, match="SHA-256"):
+            await manager._stream_download(job)
+
+        assert job.bytes_downloaded == 0
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("matches", [True, False])
+def test_download_verifies_segmented_archive(
+    make_job, served_requests, response_headers, monkeypatch, matches: bool
+) -> None:
+    monkeypatch.setattr(manager_module, "_SEGMENTED_DOWNLOAD_MIN_BYTES", 0)
+    digest = base64.b64encode(hashlib.sha256(PAYLOAD if matches else b"other").digest()).decode()
+    response_headers["Repr-Digest"] = f"sha-256=:{digest}:"
+
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("segmented-digest")
+        if matches:
+            await manager._stream_download(job)
+            assert job.archive_path.read_bytes() == PAYLOAD
+        else:
+            with pytest.raises(ValueError, match="SHA-256"):
+                await manager._stream_download(job)
+            assert job.bytes_downloaded == 0
+            assert job.segments is None
+        assert len(served_requests) == 1 + config.DEFAULT_DOWNLOAD_CONNECTIONS
+
+    asyncio.run(run())
+
+
+def test_download_verifies_resumed_archive(make_job, served_requests, response_headers) -> None:
+    digest = base64.b64encode(hashlib.sha256(b"other").digest()).decode()
+    response_headers["Repr-Digest"] = f"sha-256=:{digest}:"
+
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("resumed-digest")
+        job.archive_path.write_bytes(PAYLOAD[:1000])
+        job.update(bytes_downloaded=1000)
+        with pytest.raises(ValueError, match="SHA-256"):
+            await manager._stream_download(job)
+
+        assert served_requests[0].headers["Range"] == "bytes=1000-"
+        assert job.bytes_downloaded == 0
+
+    asyncio.run(run())
+
+
+def test_download_does_not_retry_client_errors(make_job, monkeypatch) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(403)
+
+    real_client = httpx.AsyncClient
+
+    def client_factory(*args, **kwargs) -> httpx.AsyncClient:
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", client_factory)
+
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("expired")
+        with pytest.raises(RuntimeError, match="403"):
+            await manager._download(job)
+
+        assert [request.method for request in requests] == ["HEAD", "GET"]
+
+    asyncio.run(run())
@@ -0,0 +1,105 @@
+"""Tests for the extraction and indexing stages run through the worker pool."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from zipfile import ZipFile
+
+import pytest
+
+from app.manager import JobManager
+from app.models import JobStatus
+
+
+def test_extract_and_index_in_worker_processes(make_job) -> None:
+    conversations = [
+        {
+            "id": "conv-1",
+            "title": "Gardening",
+            "create_time": 1700000000,
+            "mapping": {
+                "node": {
+                    "message": {
+                        "author": {"role": "user"},
+                        "content": {"parts": ["How do I prune tomatoes?"]},
+                    }
+                }
+            },
+        }
+    ]
+    job = make_job("pipeline")
+    with ZipFile(job.archive_path, "w") as archive:
+        archive.writestr("conversations.json", json.dumps(conversations))
+
+    async def run() -> None:
+        manager = JobManager()
+        manager._jobs[job.id] = job
+        try:
+            await manager._extract(job)
+            assert (job.extract_path / "conversations.json").exists()
+            assert job.extracted_at is not None
+            assert job.stage_detail == "Extraction complete"
+
+            await manager._index(job)
+            assert job.progress == 1.0
+            job.set_stage("completed", JobStatus.COMPLETED)
+
+            results = await manager.search(job.id, "tomatoes")
+            assert [item["conversation_id"] for item in results] == ["conv-1"]
+        finally:
+            await manager.shutdown()
+
+    asyncio.run(run())
+
+
+def test_extract_skips_archive_already_unpacked(make_job) -> None:
+    # The archive is gone, so reaching the worker pool would fail the job.
+    job = make_job("unpacked", extracted_at=datetime.now(timezone.utc))
+    job.extract_path.mkdir()
+
+    async def run() -> None:
+        manager = JobManager()
+        try:
+            await manager._extract(job)
+            assert job.stage_detail == "Archive already unpacked"
+            assert manager._workers._executor is None
+        finally:
+            await manager.shutdown()
+
+    asyncio.run(run())
+
+
+def test_worker_pool_recovers_after_a_worker_dies(make_job) -> None:
+    job = make_job("recovered")
+    with ZipFile(job.archive_path, "w") as archive:
+        archive.writestr("notes.txt", "still works")
+
+    async def run() -> None:
+        manager = JobManager()
+        try:
+            # Stands in for a worker killed mid-job, e.g. by the OOM killer.
+            with pytest.raises(BrokenProcessPool):
+                await manager._workers.run(os._exit, 1)
+
+            await manager._extract(job)
+            assert (job.extract_path / "notes.txt").read_text(encoding="utf-8") == "still works"
+        finally:
+            await manager.shutdown()
+
+    asyncio.run(run())
+
+
+def test_worker_pool_is_not_restarted_after_shutdown(isolated_data_dir) -> None:
+    async def run() -> None:
+        manager = JobManager()
+        await manager.shutdown()
+
+        with pytest.raises(RuntimeError, match="shut down"):
+            await manager._workers.run(os.getpid)
+        assert manager._workers._executor is None
+
+    asyncio.run(run())
@@ -4,40 +4,24 @@ from __future__ import annotations
 
 import asyncio
 import json
-from pathlib import Path
+import time
 
 import pytest
 
-from app import config
+from app import config, manager as manager_module
 from app.manager import JobManager
 from app.models import Job, JobStatus
+from app.utils import dump_json
 
 
-@pytest.fixture
-def isolated_data_dir(tmp_path, monkeypatch) -> Path:
-    data_dir = tmp_path / "data"
-    downloads = data_dir / "downloads"
-    extracted = data_dir / "extracted"
-    indexes = data_dir / "indexes"
-    tmp_dir = data_dir / "tmp"
-    for path in (data_dir, downloads, extracted, indexes, tmp_dir):
-        path.mkdir(parents=True, exist_ok=True)
-    monkeypatch.setattr(config, "DATA_DIR", data_dir)
-    monkeypatch.setattr(config, "DOWNLOAD_DIR", downloads)
-    monkeypatch.setattr(config, "EXTRACT_DIR", extracted)
-    monkeypatch.setattr(config, "INDEX_DIR", indexes)
-    monkeypatch.setattr(config, "TMP_DIR", tmp_dir)
-    return data_dir
-
-
-def test_restart_requeues_incomplete_jobs(isolated_data_dir: Path, monkeypatch) -> None:
+def _persisted_jobs() -> list[dict]:
+    return json.loads((config.DATA_DIR / "jobs.json").read_text(encoding="utf-8"))["jobs"]
+
+
+def test_restart_requeues_incomplete_jobs(make_job, monkeypatch) -> None:
     async def run() -> None:
-        job = Job(
-            id="job123",
-            url="https://example.com/archive.zip",
-            archive_path=config.DOWNLOAD_DIR / "job123.zip",
-            extract_path=config.EXTRACT_DIR / "job123",
-            index_path=config.INDEX_DIR / "job123.sqlite3",
+        job = make_job(
+            "job123",
             status=JobStatus.DOWNLOADING,
             stage="downloading",
             stage_detail="Halfway",
@@ -46,7 +30,7 @@ def test_restart_requeues_incomplete_jobs(isolated_data_dir: Path, monkeypatch)
             total_bytes=256,
         )
         jobs_file = config.DATA_DIR / "jobs.json"
-        jobs_file.write_text(json.dumps([job.snapshot()]), encoding="utf-8")
+        jobs_file.write_bytes(dump_json([job.snapshot()]))
 
         manager = JobManager()
 
@@ -69,7 +53,7 @@ def test_restart_requeues_incomplete_jobs(isolated_data_dir: Path, monkeypatch)
         assert info.stage_detail == "Re-queued after restart"
         assert info.message == "Job automatically re-queued after restart"
 
-        persisted = json.loads(jobs_file.read_text(encoding="utf-8"))
+        persisted = _persisted_jobs()
         assert persisted[0]["status"] == JobStatus.PENDING.value
         assert persisted[0]["stage"] == "queued"
         assert persisted[0]["message"] == "Job automatically re-queued after restart"
@@ -77,19 +61,16 @@ def test_restart_requeues_incomplete_jobs(isolated_data_dir: Path, monkeypatch)
     asyncio.run(run())
 
 
-def test_restart_marks_jobs_failed_without_source(isolated_data_dir: Path) -> None:
+def test_restart_marks_jobs_failed_without_source(make_job) -> None:
     async def run() -> None:
-        job = Job(
-            id="missing-url",
+        job = make_job(
+            "missing-url",
             url="",
-            archive_path=config.DOWNLOAD_DIR / "missing-url.zip",
-            extract_path=config.EXTRACT_DIR / "missing-url",
-            index_path=config.INDEX_DIR / "missing-url.sqlite3",
             status=JobStatus.DOWNLOADING,
             stage="downloading",
         )
         jobs_file = config.DATA_DIR / "jobs.json"
-        jobs_file.write_text(json.dumps([job.snapshot()]), encoding="utf-8")
+        jobs_file.write_bytes(dump_json([job.snapshot()]))
 
         manager = JobManager()
         await manager.startup()
@@ -101,9 +82,134 @@ def test_restart_marks_jobs_failed_without_source(isolated_data_dir: Path) -> No
         assert info.stage_detail == "Missing source URL; cannot resume"
         assert info.message == "Job missing source URL when restarting"
 
-        persisted = json.loads(jobs_file.read_text(encoding="utf-8"))
+        persisted = _persisted_jobs()
         assert persisted[0]["status"] == JobStatus.FAILED.value
         assert persisted[0]["stage"] == "failed"
         assert persisted[0]["message"] == "Job missing source URL when restarting"
 
     asyncio.run(run())
+
+
+def test_restart_replays_job_journal(make_job) -> None:
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("journalled")
+        manager._jobs[job.id] = job
+        await manager._persist_jobs()
+        job.set_stage("completed", JobStatus.COMPLETED, detail="Index ready")
+        await manager._persist_jobs()
+
+        journal_file = config.DATA_DIR / "jobs.ndjson"
+        entries = [json.loads(line) for line in journal_file.read_text(encoding="utf-8").splitlines()]
+        assert len(entries) == 2
+        assert entries[1]["id"] == job.id
+        assert entries[1]["status"] == JobStatus.COMPLETED.value
+        assert "url" not in entries[1]
+
+        restarted = JobManager()
+        info = await restarted.get_job(job.id)
+        assert info is not None
+        assert info.status == JobStatus.COMPLETED
+        assert info.stage_detail == "Index ready"
+
+        assert not journal_file.exists()
+        persisted = _persisted_jobs()
+        assert persisted[0]["status"] == JobStatus.COMPLETED.value
+
+    asyncio.run(run())
+
+
+def test_restart_ignores_journal_left_by_interrupted_compaction(make_job) -> None:
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("compacted")
+        manager._jobs[job.id] = job
+        job.set_stage("indexing", JobStatus.INDEXING)
+        await manager._persist_jobs()
+        journal_file = config.DATA_DIR / "jobs.ndjson"
+        stale_journal = journal_file.read_bytes()
+
+        job.set_stage("completed", JobStatus.COMPLETED, detail="Index ready")
+        await manager._compact_jobs()
+        # Crash after jobs.json was replaced but before the old journal was removed.
+        journal_file.write_bytes(stale_journal)
+
+        restarted = JobManager()
+        info = await restarted.get_job(job.id)
+        assert info is not None
+        assert info.status == JobStatus.COMPLETED
+        assert info.stage_detail == "Index ready"
+
+    asyncio.run(run())
+
+
+def test_shutdown_flushes_pending_changes(make_job) -> None:
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("pending")
+        manager._jobs[job.id] = job
+        for fraction in (0.25, 0.5, 0.75):
+            job.set_progress(fraction)
+            manager._mark_dirty()
+        await manager.shutdown()
+
+        journal_file = config.DATA_DIR / "jobs.ndjson"
+        entries = [json.loads(line) for line in journal_file.read_text(encoding="utf-8").splitlines()]
+        assert len(entries) == 1
+        assert entries[0]["progress"] == 0.75
+
+    asyncio.run(run())
+
+
+def test_job_changes_from_worker_threads_are_persisted(make_job, monkeypatch) -> None:
+    monkeypatch.setattr(manager_module, "_PERSIST_DEBOUNCE_SECONDS", 0)
+
+    async def run() -> None:
+        manager = JobManager()
+        job = make_job("threaded", on_change=manager._job_changed)
+        manager._jobs[job.id] = job
+        job.set_stage("indexing", JobStatus.INDEXING, detail="Creating search index")
+        await asyncio.to_thread(manager._apply_worker_progress, job.id, "indexing", 0.5, "Indexed 5/10")
+
+        # No shutdown() here: the change has to reach the journal through the on_change hook.
+        journal_file = config.DATA_DIR / "jobs.ndjson"
+        deadline = time.monotonic() + 5
+        while True:
+            persisted = {}
+            if journal_file.exists():
+                for line in journal_file.read_text(encoding="utf-8").splitlines():
+                    persisted.update(json.loads(line))
+            if persisted.get("stage_detail") == "Indexed 5/10":
+                break
+            assert time.monotonic() < deadline, f"worker progress never journalled: {persisted}"
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+
+
+def test_shutdown_cancels_running_jobs_so_they_resume(isolated_data_dir, monkeypatch) -> None:
+    async def run() -> str:
+        manager = JobManager()
+        started = asyncio.Event()
+
+        async def stalled_download(job: Job) -> None:
+            job.set_stage("downloading", JobStatus.DOWNLOADING, detail="Starting download")
+            started.set()
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(manager, "_download", stalled_download)
+        job = await manager.create_job("https://example.com/archive.zip")
+        await started.wait()
+        await manager.shutdown()
+
+        assert job.status == JobStatus.DOWNLOADING
+        assert not manager._tasks
+        with pytest.raises(RuntimeError, match="shut down"):
+            manager._http_client()
+        with pytest.raises(RuntimeError, match="shut down"):
+            await manager.create_job("https://example.com/other.zip")
+        return job.id
+
+    job_id = asyncio.run(run())
+
+    assert JobManager()._resume_job_ids == [job_id]
@@ -0,0 +1,29 @@
+"""Tests for shared helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.utils import human_readable_bytes
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (0, "0 B"),
+        (1023, "1023 B"),
+        (1024, "1.0 KiB"),
+        (1024 * 1024 - 1, "1024.0 KiB"),
+        (1024 * 1024, "1.0 MiB"),
+        (5 * 1024**3 + 512 * 1024**2, "5.5 GiB"),
+        (2**50, "1.0 PiB"),
+        (2**60, "1.0 EiB"),
+        (2**70, "1024.0 EiB"),
+    ],
+)
+def test_human_readable_bytes(value: int, expected: str) -> None:
+    assert human_readable_bytes(value) == expected
+
+
+def test_human_readable_bytes_precision() -> None:
+    assert human_readable_bytes(1536, precision=2) == "1.50 KiB"